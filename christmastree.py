@@ -3,10 +3,9 @@ Configure different LED patterns for RGB Christmas Tree
 This module provides various lighting effects including swirl, spin, sparkle, and random colour patterns.
 '''
 from tree import FastRGBChristmasTree
-from time import sleep
-from random import random
+from time import monotonic, sleep
 from colorzero import Color
-from collections import deque
+import numpy as np
 
 # Constants for tree configuration
 NUM_LEDS = 25
@@ -29,6 +28,93 @@ GRADIENT_RYG = [RED, YELLOW, GREEN]        # Red->Yellow->Green
 GRADIENT_YGB = [YELLOW, GREEN, BLUE]       # Yellow->Green->Blue
 GRADIENT_GBR = [GREEN, BLUE, RED]          # Green->Blue->Red
 GRADIENT_BRY = [BLUE, RED, YELLOW]         # Blue->Red->Yellow
+GRADIENTS = [GRADIENT_RYG, GRADIENT_YGB, GRADIENT_GBR, GRADIENT_BRY]
+
+# Colour wheel for the spin effect, one colour per segment
+SPIN_COLOURS = [WHITE, RED, GREEN, BLUE, WHITE, YELLOW, MAGENTA, CYAN]
+
+# Shared random number generator for the random effects
+_rng = np.random.default_rng()
+
+# Prebuilt SPI frames for the fixed-phase effects, keyed by (effect, phase)
+_frame_cache = {}
+
+
+def _get_spi_frames(tree, effect, builder):
+    """
+    Return the prebuilt SPI frames for a fixed-phase effect, oldest first.
+
+    On first use the effect's channel frames are loaded into the tree and
+    snapshotted as complete SPI frames; later calls hit the cache, so the
+    steady-state effect loop is nothing but SPI transfers and sleeps.
+
+    Args:
+        tree: The FastRGBChristmasTree to build frames for
+        effect: Cache key naming the effect (e.g. 'swirl')
+        builder: Function building the effect's channel frames
+
+    Returns:
+        list: One bytes object per phase, ready for tree.commit_prebuilt()
+    """
+    if (effect, 0) not in _frame_cache:
+        for phase, frame in enumerate(builder(tree)):
+            tree._chan[:] = frame
+            _frame_cache[(effect, phase)] = tree.spi_frame()
+    return [_frame_cache[key] for key in
+            sorted(key for key in _frame_cache if key[0] == effect)]
+
+
+def _init_swirl_frames(tree):
+    """
+    Precompute every rotation phase of the swirl effect.
+
+    The swirl only ever shows four distinct frames, so they are built once
+    up front as ready-to-commit channel arrays in the tree's [start, B, G, R]
+    layout. Playing a frame is then a single array copy plus one SPI transfer.
+
+    Args:
+        tree: The FastRGBChristmasTree to build frames for
+
+    Returns:
+        numpy.ndarray: Array of shape (4, 4, nled) holding the four phases
+    """
+    frames = np.empty((4, 4, len(tree)), dtype=np.uint8)
+    for phase in range(4):
+        frame = frames[phase]
+        frame[0] = tree._chan[0]  # keep the configured brightness bytes
+        for segment in range(NUM_SEGMENTS):
+            gradient = GRADIENTS[(phase + segment // 2) % len(GRADIENTS)]
+            for layer, (r, g, b) in enumerate(gradient):
+                frame[1:4, tree.leds[layer, segment]] = [b, g, r]
+        # The star/top LED stays white in every phase
+        frame[1:4, STAR_INDEX] = 255
+    return frames
+
+
+def _init_spin_frames(tree):
+    """
+    Precompute every rotation phase of the spin effect.
+
+    Rotating 8 colours over 8 segments only ever produces 8 distinct
+    frames, so they are built once up front in the tree's [start, B, G, R]
+    channel layout, like the swirl frames.
+
+    Args:
+        tree: The FastRGBChristmasTree to build frames for
+
+    Returns:
+        numpy.ndarray: Array of shape (8, 4, nled) holding the eight phases
+    """
+    frames = np.empty((len(SPIN_COLOURS), 4, len(tree)), dtype=np.uint8)
+    for phase in range(len(SPIN_COLOURS)):
+        frame = frames[phase]
+        frame[0] = tree._chan[0]  # keep the configured brightness bytes
+        for segment in range(NUM_SEGMENTS):
+            r, g, b = SPIN_COLOURS[(segment + phase) % len(SPIN_COLOURS)]
+            frame[1:4, tree.leds[:, segment]] = [[b], [g], [r]]
+        # The star/top LED stays white in every phase
+        frame[1:4, STAR_INDEX] = 255
+    return frames
 
 
 def random_colour():
@@ -41,12 +127,39 @@ def random_colour():
         list: RGB values as integers [0-255, 0-255, 0-255]
     """
     # Create colour directly with random hue, full saturation and value
-    colour = Color.from_hsv(random(), 1, 1)
+    colour = Color.from_hsv(_rng.random(), 1, 1)
     
     # Convert from colorzero's 0-1 RGB range to 0-255 integer range
     return [int(c * 255) for c in colour.rgb]
 
 
+def random_colours(n):
+    """
+    Generate n random fully saturated, full brightness colours at once.
+
+    Vectorised equivalent of random_colour(): converts a batch of random
+    hues from HSV to RGB entirely in NumPy, avoiding one colorzero object
+    allocation per colour.
+
+    Args:
+        n: Number of colours to generate
+
+    Returns:
+        numpy.ndarray: RGB values as a (n, 3) uint8 array
+    """
+    # With full saturation and value, HSV->RGB reduces to picking one of
+    # six hue sectors with a rising (t) or falling (q) middle channel
+    h6 = _rng.random(n) * 6
+    sector = h6.astype(np.uint8)
+    f = h6 - sector
+    t = (f * 255).astype(np.uint8)
+    q = ((1 - f) * 255).astype(np.uint8)
+    r = np.choose(sector, [255, q, 0, 0, t, 255])
+    g = np.choose(sector, [t, 255, 255, q, 0, 0])
+    b = np.choose(sector, [0, 0, t, 255, 255, q])
+    return np.stack([r, g, b], axis=-1).astype(np.uint8)
+
+
 def swirl(count, delay=DEFAULT_FRAME_DELAY):
     """
     Create a rotating swirl pattern with colour bands across tree layers.
@@ -59,25 +172,24 @@ def swirl(count, delay=DEFAULT_FRAME_DELAY):
         delay: Time in seconds between frames (default: 0.5)
     """
     tree = FastRGBChristmasTree()
-    
-    # Use deque for efficient rotation of gradient patterns
-    gradients = deque([GRADIENT_RYG, GRADIENT_YGB, GRADIENT_GBR, GRADIENT_BRY])
-    
-    # Set the star/top LED to white (only needs to be set once)
-    tree[STAR_INDEX] = WHITE
-    
+
+    # Replay the four prebuilt rotation phases straight down the SPI bus
+    frames = _get_spi_frames(tree, 'swirl', _init_swirl_frames)
+    phase = 0
+
+    # Pace frames against a monotonic deadline so the time spent committing
+    # does not drift the cadence
+    deadline = monotonic()
     for _ in range(count):
-        # Assign colour gradients to each segment pair
-        for segment_pair, gradient in enumerate(gradients):
-            tree[:, segment_pair * 2] = gradient
-            tree[:, segment_pair * 2 + 1] = gradient
+        deadline += delay
+        tree.commit_prebuilt(frames[phase])
 
-        tree.commit()  # Send the LED data to the tree
+        # Advance to the next phase for the spinning effect
+        phase = (phase + 1) % len(frames)
 
-        # Rotate gradients for spinning effect (deque rotation is O(1))
-        gradients.rotate(-1)
-        
-        sleep(delay)
+        remaining = deadline - monotonic()
+        if remaining > 0:
+            sleep(remaining)
 
 
 def spin(count, delay=DEFAULT_FRAME_DELAY):
@@ -92,24 +204,24 @@ def spin(count, delay=DEFAULT_FRAME_DELAY):
         delay: Time in seconds between frames (default: 0.5)
     """
     tree = FastRGBChristmasTree()
-    
-    # Use deque for efficient rotation of colours
-    colours = deque([WHITE, RED, GREEN, BLUE, WHITE, YELLOW, MAGENTA, CYAN])
 
-    # Set the star/top LED to white (only needs to be set once)
-    tree[STAR_INDEX] = WHITE
-    
-    for _ in range(count):
-        # Assign colours to segments around the tree
-        for segment, colour in enumerate(colours):
-            tree[:, segment] = colour
+    # Replay the eight prebuilt rotation phases straight down the SPI bus
+    frames = _get_spi_frames(tree, 'spin', _init_spin_frames)
+    phase = 0
 
-        tree.commit()  # Send the LED data to the tree
+    # Pace frames against a monotonic deadline so the time spent committing
+    # does not drift the cadence
+    deadline = monotonic()
+    for _ in range(count):
+        deadline += delay
+        tree.commit_prebuilt(frames[phase])
 
-        # Rotate colours for spinning effect (deque rotation is O(1))
-        colours.rotate(-1)
+        # Advance to the next phase for the spinning effect
+        phase = (phase + 1) % len(frames)
 
-        sleep(delay)
+        remaining = deadline - monotonic()
+        if remaining > 0:
+            sleep(remaining)
 
 
 def sparkle(count, on_probability=0.66):
@@ -124,12 +236,15 @@ def sparkle(count, on_probability=0.66):
         on_probability: Chance (0-1) that each LED is on (default: 0.66)
     """
     tree = FastRGBChristmasTree()
-    
+
+    # All sparkle frames run at brightness 1; set the start bytes once
+    tree.brightness = 1
+
     for _ in range(count):
-        for i in range(NUM_LEDS):
-            # Determine if LED should be on based on probability
-            brightness = 255 if random() < on_probability else 0
-            tree[i] = [1, brightness, brightness, brightness]
+        # Draw all 25 on/off decisions in one go and broadcast the result
+        # across the B, G and R channel rows
+        mask = _rng.random(NUM_LEDS) < on_probability
+        tree._chan[1:4, :] = np.where(mask, 255, 0).astype(np.uint8)
         tree.commit()
 
 
@@ -144,11 +259,15 @@ def randomcolour(count):
         count: Number of animation frames to display
     """
     tree = FastRGBChristmasTree()
-    
+
+    # All frames run at brightness 1; set the start bytes once
+    tree.brightness = 1
+
     for _ in range(count):
-        for i in range(NUM_LEDS):
-            rgb = random_colour()
-            tree[i] = [1, *rgb]  # Unpack RGB values using splat operator
+        # Generate all 25 colours in one batch and write them RGB->BGR
+        # into the colour channel rows
+        rgb = random_colours(NUM_LEDS)
+        tree._chan[1:4, :] = rgb.T[::-1]
         tree.commit()
 
 
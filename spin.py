@@ -3,28 +3,28 @@ Configure the LED into a spinning swirl
 '''
 from tree import FastRGBChristmasTree
 from time import sleep
+from collections import deque
 
 if __name__ == '__main__':
     tree = FastRGBChristmasTree()
-    i = list(range(0,8))
-
+    colours = deque([[255, 255, 255],
+                     [255, 0, 0],
+                     [0, 255, 0],
+                     [0, 0, 255],
+                     [255, 255, 255],
+                     [255, 255, 0],
+                     [255, 0, 255],
+                     [0, 255, 255]])
 
     tree[3] = [255,255,255]
     while True:
-        tree[:,i[0]] = [255, 255, 255]
-        tree[:,i[1]] = [255, 0, 0]
-        tree[:,i[2]] = [0, 255, 0]
-        tree[:,i[3]] = [0, 0, 255]
-        tree[:,i[4]] = [255, 255, 255]
-        tree[:,i[5]] = [255, 255, 0]
-        tree[:,i[6]] = [255, 0, 255]
-        tree[:,i[7]] = [0, 255, 255]
+        for segment, colour in enumerate(colours):
+            tree[:,segment] = colour
 
         tree.commit()
 
-        t = i[0]
-        for j in range(0,7):
-            i[j] = i[j+1]
-        i[7] = t
+        # Rotate the colour wheel in O(1) instead of shifting every
+        # element by hand
+        colours.rotate(1)
 
         sleep(0.5)
@@ -1,5 +1,21 @@
 from gpiozero import SPIDevice, SourceMixin
-from numpy import array
+from queue import Empty, Queue
+from sys import is_finalizing
+from threading import Thread
+
+try:
+    from numpy import arange, array, ascontiguousarray, atleast_2d, dtype, \
+        intp, uint8, zeros
+    _HAVE_NUMPY = True
+
+    # Wire format of a single APA102 LED frame
+    LED_DTYPE = dtype([('start', 'u1'), ('b', 'u1'), ('g', 'u1'),
+                       ('r', 'u1')])
+except ImportError:
+    # Fall back to array.array buffers -- the driver stays fully
+    # functional, just without the vectorised write paths
+    from array import array
+    _HAVE_NUMPY = False
 
 class FastRGBChristmasTree(SourceMixin, SPIDevice):
     '''
@@ -25,32 +41,88 @@ class FastRGBChristmasTree(SourceMixin, SPIDevice):
             is not specified. Brightness has to be between 0 to 30 (inclusive).
     '''
 
-    def __init__(self, brightness=0, autocommit=False):
+    def __init__(self, brightness=0, autocommit=False, async_commit=True):
         '''
         Constructor
 
         Args:
             brightness (int): Sets the brightness attribute.
             autocommit (bool): Sets the autocommit attribute.
+            async_commit (bool): Whether to ship SPI frames from a worker
+                thread. With this enabled, commit() only snapshots the frame
+                and queues it; it blocks only while a previous frame is still
+                on the bus. Disable to transfer synchronously in the caller.
         '''
         super(FastRGBChristmasTree, self).__init__(mosi_pin=12, clock_pin=25)
+
+        # On hardware SPI backends, raise the clock (APA102 tolerates well
+        # above the default) and transfer through the spidev handle directly,
+        # skipping gpiozero's per-element conversion. Software (bit-banged)
+        # SPI has neither knob, so fall back to the generic transfer.
+        interface = getattr(self._spi, '_interface', None)
+        if interface is not None and hasattr(interface, 'xfer2'):
+            interface.max_speed_hz = 8000000
+            self.__transfer = interface.xfer2
+        else:
+            self.__transfer = self._spi.transfer
+
         # Number of LEDs
         self.nled = 25
         # LED configuration array
-        self.__led_config = array([[24, 19, 7, 0, 16, 15, 6, 12],
-                                   [23, 20, 8, 1, 17, 14, 5, 11],
-                                   [22, 21, 9, 2, 18, 13, 4, 10]])
+        led_config = [[24, 19, 7, 0, 16, 15, 6, 12],
+                      [23, 20, 8, 1, 17, 14, 5, 11],
+                      [22, 21, 9, 2, 18, 13, 4, 10]]
+
         # Start of array __offset
         self.__offset = 4
 
-        # frame padding
-        frame_s = [0] * (self.__offset)
-        frame_end = [0] * 5
-
-        # transmit buffer
-        self.__buf = frame_s + [0] * self.nled * 4 +frame_end
+        if _HAVE_NUMPY:
+            self.__led_config = array(led_config)
+            # Cached per-segment column indices, so segment writes like
+            # tree[:, seg] go straight to a fancy-indexed store without
+            # re-slicing the configuration array
+            self.__col_idx = [ascontiguousarray(self.__led_config[:, s],
+                                                dtype=intp)
+                              for s in range(self.__led_config.shape[1])]
+
+            # transmit buffer -- start frame padding, 4 bytes per LED,
+            # end frame
+            self.__buf = zeros(self.__offset + self.nled * 4 + 5,
+                               dtype=uint8)
+
+            # Two views straight into the LED region of the transmit buffer,
+            # so writes land in the wire format without a copy at commit
+            # time:
+            #  - _chan: channel-major uint8 rows [start, B, G, R], for
+            #    whole-frame and per-channel block writes
+            #  - _led: one LED_DTYPE record per LED, for field-wise access
+            s = self.__offset
+            led_region = self.__buf[s:s + self.nled * 4]
+            self._chan = led_region.reshape(self.nled, 4).T
+            self._led = led_region.view(LED_DTYPE)
+        else:
+            self.__led_config = led_config
+            self.__buf = array('B',
+                               bytes(self.__offset + self.nled * 4 + 5))
+
+        # Transmit worker -- commit() snapshots the frame into fresh bytes
+        # and queues it, so rendering the next frame overlaps the SPI
+        # transaction. The single-slot queue provides backpressure.
+        if async_commit:
+            self.__tx_queue = Queue(maxsize=1)
+            # The worker must not hold a reference to self, otherwise the
+            # thread registry would keep the tree (and its pins) alive even
+            # after the last user reference is dropped
+            self.__tx_thread = Thread(target=self.__tx_worker,
+                                      args=(self.__tx_queue,
+                                            self.__transfer),
+                                      daemon=True)
+            self.__tx_thread.start()
+        else:
+            self.__tx_thread = None
 
         self.brightness = brightness
+        self.gamma = 1.0
         self.reset()
 
         self.autocommit = autocommit
@@ -87,53 +159,74 @@ class FastRGBChristmasTree(SourceMixin, SPIDevice):
             IndexError: If there is a dimensional mismatch between the LED
             indices and the dimension of the colour list.
         '''
+        # Normalise the index: slices and 2-tuples map through the LED
+        # configuration array, single integers address one LED directly
         if isinstance(ind, tuple) or isinstance(ind, slice):
             # Shortcut for the writing the star as a layer
             if isinstance(ind, tuple) and (ind[0] == 3):
-                self.__setitem__(3, val)
-                return
-
-            # Handle changing multiple LEDs
-            autocommit_disengaged = False
-            if self.autocommit:
-                autocommit_disengaged = True
-                self.autocommit = False
-            r = self.__led_config[ind].flatten()
-            if type(val[0]) is not list:
-                for i in r:
-                    self.__setitem__(i, val)
-            elif len(val) == len(r):
-                for i in range(0, len(val)):
-                    self.__setitem__(r[i], val[i])
+                ind = [3]
+            elif (_HAVE_NUMPY and isinstance(ind, tuple)
+                    and ind[0] == slice(None) and isinstance(ind[1], int)):
+                # Whole-segment write -- use the cached column index
+                ind = self.__col_idx[ind[1]]
+            elif _HAVE_NUMPY:
+                ind = self.__led_config[ind].flatten()
             else:
+                ind = self.__config_select(ind)
+        else:
+            ind = [ind]
+        nled = len(ind)
+
+        if _HAVE_NUMPY:
+            # Validate once, vectorised, then write each channel in one go
+            vals = atleast_2d(array(val))
+            if vals.shape[0] != 1 and vals.shape[0] != nled:
                 raise IndexError("Mismatch between the LED indices and the \
 dimension of the colour list. ")
-            if autocommit_disengaged:
-                self.autocommit = True
-                self.commit()
-            return
-
-        if len(val) < 3 or len(val) > 4:
-            raise IndexError("The length of the val array must be between 3 \
-and 4.")
-
-        for i in val:
-            if i >255:
+            if vals.shape[1] < 3 or vals.shape[1] > 4:
+                raise IndexError("The length of the val array must be \
+between 3 and 4.")
+            if (vals > 255).any():
                 raise ValueError("The val must be between 0-255!")
 
-        s = self.__offset + ind * 4
+            if vals.shape[1] == 4:
+                if (vals[:, 0] > 30).any() or (vals[:, 0] < 0).any():
+                    raise ValueError("The brightness must be between 0 \
+and 30")
+                self._led['start'][ind] = 0b11100000 | (vals[:, 0] + 1)
+                vals = vals[:, 1:]
 
-        if len(val) == 3:
-            s += 1
-        else:
-            self.__buf[s] = self.__brightness_convert(val[0])
-            s += 1
+            self._led['r'][ind] = vals[:, 0]
+            self._led['g'][ind] = vals[:, 1]
+            self._led['b'][ind] = vals[:, 2]
 
-        # Swap RGB to BGR, we use negative indexing, so it is agnostic to the
-        # size of val
-        self.__buf[s]   = val[-1]
-        self.__buf[s+1] = val[-2]
-        self.__buf[s+2] = val[-3]
+            if self.autocommit:
+                self.commit()
+            return
+
+        # Fallback: validate and write one LED at a time
+        vals = list(val) if isinstance(val[0], (list, tuple)) else [val]
+        if len(vals) != 1 and len(vals) != nled:
+            raise IndexError("Mismatch between the LED indices and the \
+dimension of the colour list. ")
+        for v in vals:
+            if len(v) < 3 or len(v) > 4:
+                raise IndexError("The length of the val array must be \
+between 3 and 4.")
+            for c in v:
+                if c > 255:
+                    raise ValueError("The val must be between 0-255!")
+
+        for k, i in enumerate(ind):
+            v = vals[k if len(vals) > 1 else 0]
+            s = self.__offset + i * 4
+            if len(v) == 4:
+                self.__buf[s] = self.__brightness_convert(v[0])
+            # Swap RGB to BGR, we use negative indexing, so it is agnostic
+            # to the size of v
+            self.__buf[s + 1] = v[-1]
+            self.__buf[s + 2] = v[-2]
+            self.__buf[s + 3] = v[-3]
 
         if self.autocommit:
             self.commit()
@@ -168,23 +261,79 @@ and 4.")
 
             # Handle request for multiple LEDs
             val = []
-            r = self.__led_config[ind].flatten()
+            if _HAVE_NUMPY:
+                r = self.__led_config[ind].flatten()
+            else:
+                r = self.__config_select(ind)
             for i in r:
                 val.append(self.__getitem__(i))
             return val
+        elif _HAVE_NUMPY:
+            led = self._led[ind]
+            return [self.__brightness_revert(int(led['start'])),
+                    int(led['r']), int(led['g']), int(led['b'])]
         else:
             s = self.__offset + ind * 4
-            val = [None] * 4
             # Swap BGR back to RGB
-            val[0] = self.__brightness_revert(self.__buf[s])
-            val[1] = self.__buf[s+3]
-            val[2] = self.__buf[s+2]
-            val[3] = self.__buf[s+1]
-            return val
+            return [self.__brightness_revert(self.__buf[s]),
+                    self.__buf[s + 3], self.__buf[s + 2], self.__buf[s + 1]]
+
+    def __array__(self, dtype=None, copy=None):
+        '''
+        Return a zero-copy view of the LED bytes as a (nled, 4) array
+
+        This makes np.asarray(tree) expose the LED region of the transmit
+        buffer, one row per LED in wire order [start, B, G, R]. Writing into
+        the view bypasses __setitem__ entirely; call commit() afterwards to
+        send the frame as usual.
+        '''
+        view = self._chan.T
+        if dtype is not None and dtype != view.dtype:
+            if copy is False:
+                raise ValueError(
+                    "Converting the LED bytes to another dtype requires a \
+copy, which copy=False forbids")
+            return view.astype(dtype)
+        if copy:
+            return view.copy()
+        return view
 
     def __del__(self):
         ''' Destructor '''
-        super(FastRGBChristmasTree, self).close()
+        self.close()
+
+    @staticmethod
+    def __tx_worker(tx_queue, transfer):
+        ''' Ship queued SPI frames until told to stop '''
+        while True:
+            frame = tx_queue.get()
+            try:
+                if frame is None:
+                    return
+                transfer(frame)
+            finally:
+                tx_queue.task_done()
+
+    def __config_select(self, ind):
+        '''
+        Pure-Python equivalent of numpy-style indexing into the LED
+        configuration array, returning a flat list of LED indices
+        '''
+        if isinstance(ind, tuple):
+            layers, segments = ind
+        else:
+            layers, segments = ind, slice(None)
+        if isinstance(layers, slice):
+            rows = self.__led_config[layers]
+        else:
+            rows = [self.__led_config[layers]]
+        out = []
+        for row in rows:
+            if isinstance(segments, slice):
+                out.extend(row[segments])
+            else:
+                out.append(row[segments])
+        return out
 
     def __brightness_convert(self, val):
         ''' Convert brightness value to buffer format  '''
@@ -198,9 +347,74 @@ and 4.")
         ''' Convert buffer brightness t to human readable format '''
         return 0b00011111 & val - 1
 
+    def __wire_frame(self):
+        ''' Build the outgoing SPI frame, applying gamma correction if set '''
+        if self.__gamma_lut is None:
+            return self.__buf.tobytes()
+        if _HAVE_NUMPY:
+            frame = self.__buf.copy()
+            led = frame[self.__offset:self.__offset + self.nled * 4]
+            led = led.reshape(self.nled, 4)
+            led[:, 1:4] = self.__gamma_lut[led[:, 1:4]]
+            return frame.tobytes()
+        frame = array('B', self.__buf)
+        for i in range(self.nled):
+            s = self.__offset + i * 4
+            frame[s + 1] = self.__gamma_lut[frame[s + 1]]
+            frame[s + 2] = self.__gamma_lut[frame[s + 2]]
+            frame[s + 3] = self.__gamma_lut[frame[s + 3]]
+        return frame.tobytes()
+
     def commit(self):
         ''' Send the current LED configuration down the SPI bus '''
-        self._spi.transfer(self.__buf)
+        frame = self.__wire_frame()
+        if self.__tx_thread is None:
+            self.__transfer(frame)
+        else:
+            self.__tx_queue.put(frame)
+
+    def commit_prebuilt(self, frame):
+        '''
+        Send a prebuilt SPI frame down the SPI bus
+
+        Allows callers with a fixed set of frames to snapshot them once via
+        spi_frame() and replay them without touching the LED configuration.
+
+        Args:
+            frame (bytes): A complete SPI frame, as returned by spi_frame().
+        '''
+        if self.__tx_thread is None:
+            self.__transfer(frame)
+        else:
+            self.__tx_queue.put(frame)
+
+    def flush(self):
+        ''' Wait until every queued SPI frame has been transferred '''
+        if self.__tx_thread is not None:
+            self.__tx_queue.join()
+
+    def close(self):
+        ''' Flush pending SPI frames, stop the worker and close the device '''
+        tx_thread = self.__dict__.pop('_FastRGBChristmasTree__tx_thread', None)
+        # At interpreter shutdown the daemon worker has already been killed,
+        # so queueing the sentinel would block forever on a full queue and
+        # the join would never return -- just close the device
+        if tx_thread is not None and not is_finalizing():
+            # Drop any frame still queued so the sentinel cannot block on
+            # the single-slot queue
+            try:
+                self.__tx_queue.get_nowait()
+                self.__tx_queue.task_done()
+            except Empty:
+                pass
+            self.__tx_queue.put(None)
+            tx_thread.join()
+        self.__tx_thread = None
+        super(FastRGBChristmasTree, self).close()
+
+    def spi_frame(self):
+        ''' Return the current LED configuration as a complete SPI frame '''
+        return self.__wire_frame()
 
     def off(self):
         ''' Turn off the LEDs '''
@@ -210,11 +424,26 @@ and 4.")
 
     def reset(self):
         ''' Reset the LEDs by sending down zeros '''
-        brightness = self.brightness
-        for i in range(0, len(self.__buf)):
-            self.__buf[i] = 0
+        if _HAVE_NUMPY:
+            self._chan[:] = 0
+        else:
+            for i in range(self.__offset, self.__offset + self.nled * 4):
+                self.__buf[i] = 0
         self.commit()
-        self.brightness = brightness
+        self.__fill_start(self.__brightness_byte)
+
+    def __fill_start(self, byte):
+        ''' Write one byte into every LED's start position '''
+        if _HAVE_NUMPY:
+            self._led['start'][:] = byte
+        else:
+            for i in range(self.nled):
+                self.__buf[self.__offset + i * 4] = byte
+
+    @property
+    def leds(self):
+        ''' Return the layer-by-segment LED index map '''
+        return self.__led_config
 
     @property
     def star(self):
@@ -226,21 +455,47 @@ and 4.")
         ''' Set the value of the star on the LEDs '''
         return self.__setitem__(3, val)
 
+    @property
+    def gamma(self):
+        ''' Return the gamma correction exponent applied at commit time '''
+        return self.__gamma
+
+    @gamma.setter
+    def gamma(self, val):
+        '''
+        Set the gamma correction exponent
+
+        Builds a 256-entry lookup table that is applied to the colour bytes
+        on their way out to the SPI bus. The stored LED configuration keeps
+        the raw values, so readback via __getitem__ is unaffected. A value
+        of 1 disables the correction.
+        '''
+        self.__gamma = val
+        if val == 1:
+            self.__gamma_lut = None
+        elif _HAVE_NUMPY:
+            self.__gamma_lut = \
+                ((arange(256) / 255.0) ** val * 255).astype(uint8)
+        else:
+            self.__gamma_lut = [int((i / 255.0) ** val * 255)
+                                for i in range(256)]
+
     @property
     def brightness(self):
         ''' Return the mean brightness of the LEDs '''
-        val = 0
-        for i in range(0, self.nled):
-            s = self.__offset + i * 4
-            val += self.__buf[s]
-        return self.__brightness_revert(int(val / self.nled))
+        if _HAVE_NUMPY:
+            return self.__brightness_revert(int(self._led['start'].mean()))
+        total = sum(self.__buf[self.__offset + i * 4]
+                    for i in range(self.nled))
+        return self.__brightness_revert(int(total / self.nled))
 
     @brightness.setter
     def brightness(self, val):
         ''' Set the brightness of the LEDs '''
-        for i in range(0, self.nled):
-            s = self.__offset + i * 4
-            self.__buf[s] = self.__brightness_convert(val)
+        # Cache the converted byte so reset() can restore the start bytes
+        # without re-deriving the brightness from the buffer
+        self.__brightness_byte = self.__brightness_convert(val)
+        self.__fill_start(self.__brightness_byte)
 
 if __name__ == '__main__':
     tree = FastRGBChristmasTree()